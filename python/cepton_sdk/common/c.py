@@ -1,4 +1,5 @@
 import ctypes
+import functools
 import os
 import os.path
 import platform
@@ -112,10 +113,17 @@ def create_c_ndarray(size, dtype):
     return get_c_ndarray(a)
 
 
-def convert_bytes_to_ndarray(a_bytes, c_type):
-    """Convert numpy bytes array to numpy array"""
+@functools.lru_cache(maxsize=None)
+def _get_c_dtype(c_type):
+    """Returns cached numpy dtype for ctypes type."""
     dtype = numpy.dtype(c_type)
     assert (sizeof(c_type) == dtype.itemsize)
+    return dtype
+
+
+def convert_bytes_to_ndarray(a_bytes, c_type):
+    """Convert numpy bytes array to numpy array"""
+    dtype = _get_c_dtype(c_type)
     a = numpy.frombuffer(a_bytes, dtype)
     assert (len(a) == len(a_bytes) / sizeof(c_type))
     return a
@@ -126,14 +134,20 @@ def convert_ndarray_to_bytes(a):
     return a.view(numpy.uint8)
 
 
+def _convert_c_array_to_bytes(n, c_a):
+    assert(isinstance(c_a, ctypes._Pointer))
+    n_bytes = n * sizeof(c_a._type_)
+    if n_bytes == 0:
+        return numpy.zeros([0], dtype=numpy.uint8)
+    # Zero-copy view; `contents` keeps reference to buffer owning memory
+    c_a_bytes = cast(c_a, POINTER(c_byte * n_bytes)).contents
+    return numpy.frombuffer(c_a_bytes, dtype=numpy.uint8)
+
+
 def convert_c_array_to_ndarray(n, c_a):
     """Convert ctypes pointer to numpy array"""
-    assert(isinstance(c_a, ctypes._Pointer))
-    c_type = c_a._type_
-    n_bytes = n * sizeof(c_type)
-    a_bytes = \
-        numpy.ctypeslib.as_array(cast(c_a, POINTER(c_byte)), shape=(n_bytes,))
-    return convert_bytes_to_ndarray(a_bytes, c_type)
+    a_bytes = _convert_c_array_to_bytes(n, c_a)
+    return convert_bytes_to_ndarray(a_bytes, c_a._type_)
 
 
 def convert_ndarray_to_c_array(a):
@@ -157,13 +171,25 @@ def unpack_bits(a):
 
 
 def pack_bits(bits, c_type):
+    """Convert array of bool to array of integers"""
     dtype = numpy.dtype(c_type)
     if bits.size == 0:
         return numpy.zeros(bits.shape[:-1], dtype=dtype)
-    # bits = bits_tmp.reshape([-1, 8])[:, ::-1]
-    a = numpy.packbits(bits.flatten()).view(dtype)
-    a = numpy.reshape([bits.shape[:-1]])
+    bits_tmp = bits.reshape([-1, 8])[:, ::-1]
+    a = numpy.packbits(bits_tmp).view(dtype)
+    a = numpy.reshape(a, bits.shape[:-1])
     return a
 
 
+def soa_to_struct(data, fields):
+    """Copy field arrays into structured array.
+
+    Args:
+        data: Structured numpy array.
+        fields: Dict of field name to array.
+    """
+    for name, a in fields.items():
+        numpy.copyto(data[name], a, casting="unsafe")
+
+
 __all__ = _all_builder.get()
@@ -1,6 +1,7 @@
 import copy
 import ctypes
 import functools
+import types
 
 import numpy
 
@@ -22,18 +23,81 @@ def static_vars(**kwargs):
     return decorate
 
 
-class single_cache:
-    """Cache result for function returning single value."""
+def _make_immutable(value):
+    if isinstance(value, numpy.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        value = types.MappingProxyType(value)
+    elif isinstance(value, list):
+        value = tuple(value)
+    return value
+
 
-    def __init__(self, func):
+class single_cache:
+    """Cache result for function returning single value.
+
+    Args:
+        copy: How the cached result is copied on return
+            (`"deep"`, `"shallow"`, or `"none"`).
+        immutable: Make cached result read-only once and return it without
+            copying.
+
+    Usage:
+        @single_cache
+        @single_cache(copy="shallow")
+        @single_cache(immutable=True)
+    """
+    _COPY_FUNCTIONS = {
+        "deep": copy.deepcopy,
+        "shallow": copy.copy,
+        "none": lambda x: x,
+    }
+    _NO_RESULT = object()
+
+    def __init__(self, func=None, copy="deep", immutable=False):
+        if copy not in self._COPY_FUNCTIONS:
+            raise ValueError("Invalid copy mode: {}".format(copy))
+        self._func = None
+        self._copy = self._COPY_FUNCTIONS["none" if immutable else copy]
+        self._immutable = immutable
+        self._result = self._NO_RESULT
+        if func is not None:
+            self._set_func(func)
+
+    def _set_func(self, func):
         self._func = func
-        self._result = None
         functools.update_wrapper(self, func)
 
     def __call__(self, *args, **kwargs):
-        if self._result is None:
-            self._result = self._func(*args, **kwargs)
-        return copy.deepcopy(self._result)
+        if self._func is None:
+            # Decorator with arguments
+            self._set_func(*args)
+            return self
+        if self._result is self._NO_RESULT:
+            result = self._func(*args, **kwargs)
+            if self._immutable:
+                result = _make_immutable(result)
+            self._result = result
+        return self._copy(self._result)
+
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _copy_value(value):
+    """Copy value, avoiding `copy.deepcopy` for common immutable types."""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, list):
+        if all(isinstance(x, _IMMUTABLE_TYPES) for x in value):
+            return list(value)
+    elif isinstance(value, tuple):
+        if all(isinstance(x, _IMMUTABLE_TYPES) for x in value):
+            return value
+    elif isinstance(value, dict):
+        if all(isinstance(x, _IMMUTABLE_TYPES) for x in value.values()):
+            return dict(value)
+    return copy.deepcopy(value)
 
 
 def numpy_property(func, **kwargs):
@@ -56,6 +120,13 @@ class ToDictMixin:
         value = dict_value
         return value
 
+    @classmethod
+    def _dict_value_is_owned(cls, member_name):
+        """Returns true if `_from_dict_value` always returns a new object for
+        member, so `update_from_dict` does not need to copy it.
+        """
+        return False
+
     def _to_dict_value(self, member_name, value):
         dict_value = value
         return dict_value
@@ -67,8 +138,8 @@ class ToDictMixin:
         for member_name in member_names:
             dict_value = d[member_name]
             value = self._from_dict_value(member_name, dict_value)
-            if deep_copy:
-                value = copy.deepcopy(value)
+            if deep_copy and not self._dict_value_is_owned(member_name):
+                value = _copy_value(value)
             setattr(self, member_name, value)
 
     @classmethod
@@ -84,10 +155,9 @@ class ToDictMixin:
         d = {}
         for member_name in member_names:
             value = getattr(self, member_name)
-            dict_value = self._to_dict_value(member_name, value)
-            if deep_copy:
-                dict_value = copy.deepcopy(dict_value)
-            d[member_name] = dict_value
+            d[member_name] = self._to_dict_value(member_name, value)
+        if deep_copy:
+            d = {k: _copy_value(v) for k, v in d.items()}
         return d
 
 
@@ -99,21 +169,36 @@ class C_Field:
 
     @classmethod
     def from_description(cls, descr):
-        if len(descr) == 3:
-            return cls(descr[0], descr[1], descr[2])
-        else:
-            return cls(descr[0], descr[1])
-
+        return cls(*descr)
 
-def _get_c_members(c_cls):
-    return {x[0]: C_Field.from_description(x) for x in c_cls._fields_ if x[0]}
 
-
-def _get_c_member_names(c_cls):
-    return [x[0] for x in c_cls._fields_ if x[0]]
+@functools.lru_cache(maxsize=None)
+def _is_c_value_owned(cls, member_name):
+    """Returns whether `cls._to_c_value` returns a value that is safe to assign
+    without copying (immutable scalar or freshly constructed array).
+    """
+    c_member = cls._get_c_member(member_name)
+    return issubclass(c_member.type, (ctypes._SimpleCData, ctypes.Array))
 
 
 class ToCMixin:
+    _c_fields_tuple = ()
+    _c_field_dict = {}
+    _c_member_names = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        try:
+            c_cls = cls._get_c_class()
+        except NotImplementedError:
+            # Abstract subclass
+            return
+        cls._c_fields_tuple = tuple(
+            (x[0], C_Field.from_description(x)) for x in c_cls._fields_
+            if x[0])
+        cls._c_field_dict = dict(cls._c_fields_tuple)
+        cls._c_member_names = tuple(x[0] for x in cls._c_fields_tuple)
+
     @classmethod
     def _get_c_class(cls):
         raise NotImplementedError()
@@ -139,22 +224,18 @@ class ToCMixin:
             c_value = value
         return c_value
 
-    @classmethod
-    def __get_c_members(cls):
-        return _get_c_members(cls._get_c_class())
-
     @classmethod
     def _get_c_member_names(cls):
-        return list(cls.__get_c_members().keys())
+        return list(cls._c_member_names)
 
     @classmethod
     def _get_c_member(cls, member_name):
-        return cls.__get_c_members()[member_name]
+        return cls._c_field_dict[member_name]
 
     @classmethod
     def from_c(cls, c_obj, deep_copy=True, member_names=None):
         if member_names is None:
-            member_names = cls._get_c_member_names()
+            member_names = cls._c_member_names
 
         obj = cls()
         for member_name in member_names:
@@ -167,7 +248,7 @@ class ToCMixin:
         if c_type is None:
             c_type = self._get_c_class()
         if member_names is None:
-            member_names = self._get_c_member_names()
+            member_names = self._c_member_names
 
         c_cls = self._get_c_class()
         c_obj = c_cls()
@@ -177,13 +258,19 @@ class ToCMixin:
             except AttributeError:
                 continue
             c_value = self._to_c_value(member_name, value)
-            if deep_copy:
+            if deep_copy and not _is_c_value_owned(type(self), member_name):
                 c_value = copy.deepcopy(c_value)
             setattr(c_obj, member_name, c_value)
 
         return c_obj
 
 
+@functools.lru_cache(maxsize=None)
+def _get_common_names(cls, other_cls):
+    other_names = set(other_cls._get_array_member_names())
+    return tuple(x for x in cls._get_array_member_names() if x in other_names)
+
+
 class StructureOfArrays:
     """
     Group multiple arrays together and allow operations on all arrays
@@ -194,13 +281,33 @@ class StructureOfArrays:
     variables.
     """
 
+    __array_member_names__ = ()
+    __array_member_set__ = frozenset()
+
     def __init__(self, n=1):
-        self._n = n
+        object.__setattr__(self, "_n", n)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        try:
+            names = cls._get_array_member_names()
+        except NotImplementedError:
+            # Abstract subclass
+            names = []
+        cls.__array_member_names__ = tuple(names)
+        cls.__array_member_set__ = frozenset(names)
 
     @classmethod
     def _get_array_member_names(cls):
         raise NotImplementedError()
 
+    def _init_array(self, name, value):
+        """Initialize array member, skipping `__setattr__` checks.
+
+        Only use from constructors.
+        """
+        object.__setattr__(self, name, value)
+
     def __len__(self):
         return self._n
 
@@ -218,32 +325,35 @@ class StructureOfArrays:
 
     def __setattr__(self, name, value):
         cls = type(self)
+        if name in cls.__array_member_set__:
+            if name in self.__dict__:
+                # Only set once
+                raise AttributeError("Member already initialized!")
+            return super().__setattr__(name, value)
         if hasattr(cls, name):
             # Static member
             return super().__setattr__(name, value)
 
-        if hasattr(self, name):
+        if name in self.__dict__:
             # Only set once
             raise AttributeError("Member already initialized!")
         if name in ["_n"]:
             # Special members
             return super().__setattr__(name, value)
-        if name not in self._get_array_member_names():
-            # Check member
-            raise AttributeError(
-                "Member `" + name + "` not listed in `_get_array_member_names`!")
-        return super().__setattr__(name, value)
+        # Check member
+        raise AttributeError(
+            "Member `" + name + "` not listed in `_get_array_member_names`!")
 
     @classmethod
     def get_common_names(cls, other):
         """Returns array member names common to both classes."""
-        return list(set(cls._get_array_member_names()) &
-                    set(other._get_array_member_names()))
+        other_cls = other if isinstance(other, type) else type(other)
+        return list(_get_common_names(cls, other_cls))
 
     def update(self, other, names=None):
         """Copy fields from other."""
         if names is None:
-            names = self.get_common_names(other)
+            names = _get_common_names(type(self), type(other))
         for name in names:
             getattr(self, name)[...] = getattr(other, name)
 
@@ -255,26 +365,53 @@ class StructureOfArrays:
         return self
 
     def _get_indices(self, key):
-        indices = numpy.arange(len(self))[key]
-        indices = numpy.reshape(indices, [-1])
-        return indices
+        """Returns slice, boolean mask, or flat index array."""
+        if key is Ellipsis:
+            return slice(None)
+        if isinstance(key, slice):
+            return key
+        indices = numpy.asarray(key)
+        if indices.dtype == bool:
+            if indices.shape != (len(self),):
+                raise IndexError("Boolean index does not match length!")
+            return indices
+        if indices.size == 0:
+            return numpy.zeros([0], dtype=numpy.intp)
+        if not numpy.issubdtype(indices.dtype, numpy.integer):
+            raise IndexError("Index must be integer or bool!")
+        if indices.ndim > 1:
+            raise IndexError("Key must be 1-d.")
+        return numpy.reshape(indices, [-1])
 
     def __getitem__(self, key):
         """Supports numpy style indexing as if object were 1-d array."""
         assert (not isinstance(key, tuple)), "Key must be 1-d."
 
         cls = type(self)
-        result = cls(numpy.arange(len(self))[key].size)
-        names = self._get_array_member_names()
-        for name in names:
-            getattr(result, name)[:] = getattr(self, name)[key]
+        indices = self._get_indices(key)
+        if isinstance(indices, slice):
+            n = len(range(*indices.indices(self._n)))
+        elif indices.dtype == bool:
+            n = numpy.count_nonzero(indices)
+        else:
+            n = indices.size
+        result = cls(n)
+        for name in self.__array_member_names__:
+            src = getattr(self, name)
+            dst = getattr(result, name)
+            if isinstance(indices, slice):
+                dst[...] = src[indices]
+            elif indices.dtype == bool:
+                numpy.compress(indices, src, axis=0, out=dst)
+            else:
+                numpy.take(src, indices, axis=0, out=dst)
         return result
 
     def __setitem__(self, key, other):
         """Supports numpy style assignment as if object were 1-d array."""
         assert (not isinstance(key, tuple)), "Key must be 1-d."
 
-        names = self.get_common_names(other)
+        names = _get_common_names(type(self), type(other))
         for name in names:
             getattr(self, name)[key] = getattr(other, name)
 
@@ -286,7 +423,7 @@ class StructureOfArrays:
         assert (not isinstance(key, tuple)), "Key must be 1-d."
         assert (not isinstance(other_key, tuple)), "Key must be 1-d."
 
-        names = self.get_common_names(other)
+        names = _get_common_names(type(self), type(other))
         for name in names:
             getattr(self, name)[key] = getattr(other, name)[other_key]
 
@@ -299,13 +436,21 @@ class StructureOfArrays:
         other_list = list(other_list)
         if len(other_list) == 0:
             return cls(0)
-        n = numpy.sum([len(x) for x in other_list])
+        n = sum(len(x) for x in other_list)
         self = cls(n)
-        offset = 0
-        for i in range(len(other_list)):
-            other = other_list[i]
-            self[offset:offset + len(other)] = other
-            offset += len(other)
+        other_cls = type(other_list[0])
+        if all(type(x) is other_cls for x in other_list):
+            names = _get_common_names(cls, other_cls)
+            for name in names:
+                numpy.concatenate([getattr(x, name) for x in other_list],
+                                  axis=0, out=getattr(self, name),
+                                  casting="unsafe")
+        else:
+            # Mixed types
+            offset = 0
+            for other in other_list:
+                self[offset:offset + len(other)] = other
+                offset += len(other)
         return self
 
 
@@ -317,9 +462,13 @@ class ToCArrayMixin:
     def _from_c_impl(self, data):
         raise NotImplementedError()
 
-    def _to_c_impl(self, data):
+    def _get_c_fields(self):
+        """Returns dict of C field name to array, used by `_to_c_impl`."""
         raise NotImplementedError()
 
+    def _to_c_impl(self, data):
+        cepton_sdk.common.c.soa_to_struct(data, self._get_c_fields())
+
     def update_from_c(self, c_a):
         if len(self) == 0:
             return
@@ -336,9 +485,13 @@ class ToCArrayMixin:
         if c_type is None:
             c_type = self._get_c_class()
 
-        data = numpy.zeros(len(self), dtype=numpy.dtype(c_type))
+        # Write directly into C buffer through ndarray view
+        c_a = (c_type * len(self))()
+        c_ptr = ctypes.cast(c_a, ctypes.POINTER(c_type))
+        if len(self) == 0:
+            return c_ptr
+        data = cepton_sdk.common.c.convert_c_array_to_ndarray(len(self), c_ptr)
         self._to_c_impl(data)
-        c_ptr = cepton_sdk.c.convert_ndarray_to_c_array(data)
         return c_ptr
 
 
@@ -85,15 +85,16 @@ class Points(StructureOfArrays, ToCArrayMixin):
 
     def __init__(self, n=0):
         super().__init__(n)
-        self.timestamps_usec = numpy.zeros([n], dtype=numpy.int64)
-        self.image_positions = numpy.zeros([n, 2])
-        self.distances = numpy.zeros([n])
-        self.positions = numpy.zeros([n, 3])
-        self.intensities = numpy.zeros([n])
-        self.return_types = numpy.zeros([n, 8], dtype=bool)
-        self.flags = numpy.zeros([n, 8], dtype=bool)
+        self._init_array(
+            "timestamps_usec", numpy.zeros([n], dtype=numpy.int64))
+        self._init_array("image_positions", numpy.zeros([n, 2]))
+        self._init_array("distances", numpy.zeros([n]))
+        self._init_array("positions", numpy.zeros([n, 3]))
+        self._init_array("intensities", numpy.zeros([n]))
+        self._init_array("return_types", numpy.zeros([n, 8], dtype=bool))
+        self._init_array("flags", numpy.zeros([n, 8], dtype=bool))
         self.flags[:, PointFlag.VALID] = True
-        self.segment_ids = numpy.zeros([n], dtype=numpy.uint8)
+        self._init_array("segment_ids", numpy.zeros([n], dtype=numpy.uint8))
 
     @classmethod
     def _get_array_member_names(cls):
@@ -119,15 +120,18 @@ class Points(StructureOfArrays, ToCArrayMixin):
         self.positions[:, :] = convert_image_points_to_points(
             self.image_positions, self.distances)
 
-    def _to_c_impl(self, data):
-        data["timestamp"][:] = self.timestamps_usec
-        data["image_x"][:] = self.positions[:, 0]
-        data["image_z"][:] = self.positions[:, 1]
-        data["distance"][:] = self.distances
-        data["intensity"][:] = self.intensities
-        data["return_type"][:] = self.return_types
-        data["segment_id"][:] = self.segment_ids
-        data["flags"] = self.flags
+    def _get_c_fields(self):
+        return {
+            "timestamp": self.timestamps_usec,
+            "image_x": self.image_positions[:, 0],
+            "image_z": self.image_positions[:, 1],
+            "distance": self.distances,
+            "intensity": self.intensities,
+            "return_type": cepton_sdk.common.c.pack_bits(
+                self.return_types, numpy.uint8),
+            "flags": cepton_sdk.common.c.pack_bits(self.flags, numpy.uint8),
+            "segment_id": self.segment_ids,
+        }
 
     @numpy_property
     def timestamps(self):
@@ -34,9 +34,9 @@ def from_gps_time(weeks, seconds):
 class Transforms(StructureOfArrays):
     def __init__(self, n=0):
         super().__init__(n)
-        self.timestamps = numpy.zeros([n])
-        self.translations = numpy.zeros([n, 3])
-        self.quaternions = numpy.zeros([n, 4])
+        self._init_array("timestamps", numpy.zeros([n]))
+        self._init_array("translations", numpy.zeros([n, 3]))
+        self._init_array("quaternions", numpy.zeros([n, 4]))
 
     @classmethod
     def _get_array_member_names(cls):